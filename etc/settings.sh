@@ -13,6 +13,13 @@ cfgdir="$etcdir/params"  # CSV tables with sets of registration parameters
 setdir="$etcdir/dataset" # dataset Shell configuration files
 vardir="var/cache"       # root directory for computed data
 csvdir="var/table"       # summary tables of average quality measures
+stodir=""                # content-addressed store of outputs shared by all datasets, regids, and cfgids
+                         # (see lib/tools/artifact-store), e.g., "var/store", or empty string to disable
+imgext=".nii.gz"         # file name extension of intermediate images written to vardir, i.e., preprocessed,
+                         # deformed, and ROI images and voxel-wise evaluation maps; ".nii" images are larger,
+                         # but much faster to read and write, and memory-mapped by lib/python/mirtk/nifti.py
+                         # (see lib/tools/benchmark-image-format); input images, transformations, and tables
+                         # are not affected, and images computed with another extension are recomputed
 
 # path of MIRTK's "mirtk" executable, either absolute or relative to topdir
 # recommended: on Linux, download MIRTK AppImage to "$optdir/" and "chmod +x $optdir/mirtk"
@@ -77,6 +84,11 @@ evljac=true
 # when 'true', create table with runtime measurements
 evltime=true
 
+# when 'true', evaluate the overlap of segmentation labels and average voxel-wise
+# measures within each label in a single pass over the label image using
+# lib/tools/evaluate-label-stats instead of creating one binary mask per label
+labelstats=true
+
 # force overwriting previously generated files, include also jobs in batch
 # description that have been run before, i.e., although output files already exist
 force=false
@@ -0,0 +1,105 @@
+"""Minimal reader of NIfTI-1 image files which only requires NumPy."""
+
+import gzip
+import numpy as np
+import struct
+
+
+# NumPy type codes of NIfTI-1 datatype codes
+datatypes = {
+    2: 'u1',
+    4: 'i2',
+    8: 'i4',
+    16: 'f4',
+    64: 'f8',
+    256: 'i1',
+    512: 'u2',
+    768: 'u4',
+    1024: 'i8',
+    1280: 'u8'
+}
+
+
+def open_nifti(path):
+    """Open NIfTI file for reading, decompressing gzip compressed files on the fly."""
+    if path.endswith('.gz'):
+        return gzip.open(path, 'rb')
+    return open(path, 'rb')
+
+
+def parse_header(data):
+    """Parse binary NIfTI-1 header."""
+    if len(data) < 348:
+        raise ValueError("NIfTI-1 header must be 348 bytes long")
+    for endian in ('<', '>'):
+        if struct.unpack(endian + 'i', data[0:4])[0] == 348:
+            break
+    else:
+        raise ValueError("Not a NIfTI-1 file")
+    dim = struct.unpack(endian + '8h', data[40:56])
+    datatype, bitpix = struct.unpack(endian + '2h', data[70:74])
+    pixdim = struct.unpack(endian + '8f', data[76:108])
+    vox_offset, scl_slope, scl_inter = struct.unpack(endian + '3f', data[108:120])
+    ndim = dim[0]
+    if ndim < 1 or ndim > 7:
+        raise ValueError("Invalid number of NIfTI-1 image dimensions: {}".format(ndim))
+    return {
+        'endian': endian,
+        'dim': dim[1:ndim + 1],
+        'pixdim': pixdim[1:ndim + 1],
+        'datatype': datatype,
+        'bitpix': bitpix,
+        'vox_offset': int(vox_offset),
+        'scl_slope': scl_slope,
+        'scl_inter': scl_inter,
+        'magic': data[344:348]
+    }
+
+
+def read_header(path):
+    """Read header of NIfTI-1 image file without reading the image data."""
+    with open_nifti(path) as f:
+        return parse_header(f.read(348))
+
+
+def get_spacing(hdr):
+    """Get voxel size of 3D image in each dimension."""
+    spacing = list(hdr['pixdim'][0:3])
+    return tuple(abs(s) for s in (spacing + [1.] * (3 - len(spacing))))
+
+
+def read_image(path, mmap=True):
+    """Read NIfTI-1 image file.
+
+    Returns a tuple of the parsed header and the array of image values, which is indexed
+    in the order of the image dimensions (i.e., x, y, z, ...). When the header specifies
+    a scaling of the stored values, the scaled floating point values are returned.
+    The data of uncompressed images is memory-mapped read-only unless 'mmap' is False.
+
+    """
+    with open_nifti(path) as f:
+        hdr = parse_header(f.read(348))
+        if hdr['magic'] != b'n+1\0':
+            raise ValueError("Only single file NIfTI-1 images are supported: " + path)
+        if hdr['datatype'] not in datatypes:
+            raise ValueError("Unsupported NIfTI-1 datatype {}: {}".format(hdr['datatype'], path))
+        dtype = np.dtype(hdr['endian'] + datatypes[hdr['datatype']])
+        count = int(np.prod(hdr['dim']))
+        offset = max(hdr['vox_offset'], 348)
+        if mmap and not path.endswith('.gz') and count > 0:
+            f.seek(0, 2)
+            if f.tell() < offset + count * dtype.itemsize:
+                raise ValueError("NIfTI-1 image data is truncated: " + path)
+            data = np.memmap(f, dtype=dtype, mode='r', offset=offset, shape=tuple(hdr['dim']), order='F')
+        else:
+            if offset > 348:
+                f.read(offset - 348)
+            buf = f.read(count * dtype.itemsize)
+            if len(buf) != count * dtype.itemsize:
+                raise ValueError("NIfTI-1 image data is truncated: " + path)
+            data = np.frombuffer(buf, dtype=dtype, count=count).reshape(hdr['dim'], order='F')
+    slope = hdr['scl_slope']
+    inter = hdr['scl_inter']
+    if slope != 0. and np.isfinite(slope) and (slope != 1. or inter != 0.):
+        data = data * slope + inter
+    return hdr, data
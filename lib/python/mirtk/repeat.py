@@ -1,19 +1,105 @@
 """Auxiliary functions for Python notebooks/scripts used to analyze and compare the results."""
 
-import collections
+import concurrent.futures
+import functools
+import json
 import numpy as np
 import os
 import pandas as pd
 import re
 import sys
 
+try:
+    from collections.abc import Iterable
+except ImportError:
+    from collections import Iterable
+
+try:
+    from pyarrow import feather
+except ImportError:
+    feather = None
+
+from mirtk import nifti
+
 
 topdir = os.path.normpath(os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..', '..')))
 
 
+def read_setting(name, default=None):
+    """Get constant value assigned to a variable in etc/settings.sh, or default if not found."""
+    re_var = re.compile(r'^' + re.escape(name) + r'=(?:"([^"$`]*)"|\'([^\']*)\'|([^\s"\'$`;#]*))(?:\s|;|$)')
+    try:
+        with open(os.path.join(topdir, 'etc', 'settings.sh'), 'r') as f:
+            for line in f:
+                m = re_var.match(line)
+                if m:
+                    default = next(value for value in m.groups() if value is not None)
+    except (IOError, OSError):
+        pass
+    return default
+
+
+# version of columnar result cache format, increment to invalidate existing cache files
+cache_version = 1
+
+# in-memory copies of result file catalogs, see get_catalog
+_catalogs = {}
+
+# label groups of each dataset, see get_label_groups
+_label_groups = {}
+
+# tables of registration parameter sets read from CSV files, see read_params_csv
+_params = {}
+
+# CSV files of registration parameter sets found in etc/params, see get_params_registry
+_params_files = None
+
+# summary statistics and reduced result tables of each parameter set, see summarize_cfgid
+_summaries = {}
+
+# voxel volume of NIfTI images keyed by path, with [mtime, volume] values, see get_voxel_volume
+_voxel_volumes = {}
+
+# file name extension of intermediate images, read from etc/settings.sh, must match
+# the 'imgext' setting with which the images were written when it is changed
+imgext = read_setting('imgext', '.nii.gz')
+
+# path of segmentation whose labels are used as ROIs of a given target, see get_label_image of gen-summarize-measures
+label_image = os.path.join('{topdir}', 'var', 'cache', '{dataset}', 'affine', 'out', '{roi}', '{tgtid}{imgext}')
+
+# ID columns of result tables which are converted to categoricals by compact_dtypes
+category_columns = ['dataset', 'regid', 'toolkit', 'command', 'version', 'tgtid', 'srcid', 'roi', 'group', 'host']
+
+# columns of runtime tables written by lib/tools/print-runtime-table, see lib/tools/measure-runtime
+time_columns = ['srcid', 'host', 'real', 'user', 'sys', 'maxrss', 'nvcsw', 'nivcsw', 'read_bytes', 'write_bytes', 'threads']
+
+# names of runtime columns in tables written by previous versions
+legacy_time_columns = {'cpu_time': 'user', 'wall_time': 'real'}
+
+# columns of table returned by summarize_results: (name, measure, column of reduced result table, statistic)
+summary_columns = [
+    ('pairs', 'dsc', 'dsc', 'count'),
+    ('dsc_mean', 'dsc', 'dsc', 'mean'),
+    ('dsc_median', 'dsc', 'dsc', 'median'),
+    ('dsc_pct5', 'dsc', 'dsc', 'pct5'),
+    ('dsc_pct95', 'dsc', 'dsc', 'pct95'),
+    ('pctexcl_mean', 'jac', 'pctexcl', 'mean'),
+    ('pctexcl_max', 'jac', 'pctexcl', 'max'),
+    ('logjac_sdev', 'jac', 'sdev', 'mean'),
+    ('mice_mean', 'mice', 'mean', 'mean'),
+    ('mice_pct95', 'mice', 'pct95', 'mean'),
+    ('mice_max', 'mice', 'max', 'max'),
+    ('real_mean', 'time', 'real', 'mean'),
+    ('real_median', 'time', 'real', 'median'),
+    ('user_mean', 'time', 'user', 'mean'),
+    ('maxrss_mean', 'time', 'maxrss', 'mean'),
+    ('maxrss_max', 'time', 'maxrss', 'max')
+]
+
+
 def is_iterable(var):
     """Check if variable is iterable, but not a string."""
-    return isinstance(var, collections.Iterable) and not isinstance(var, str)
+    return isinstance(var, Iterable) and not isinstance(var, str)
 
 
 def is_overlap_measure(measure):
@@ -67,20 +153,195 @@ def get_csvdir(dataset, regid, cfgid=None):
     return csvdir
 
 
-def get_cfgids(dataset, regid):
+def get_cachedir(dataset, regid, cfgid=None):
+    """Get absolute path of columnar cache files of result tables."""
+    cachedir = os.path.join(topdir, 'var', 'table', '.cache', dataset, regid)
+    if cfgid:
+        cachedir = os.path.join(cachedir, cfgidstr(cfgid))
+    return cachedir
+
+
+def scan_csvdir(csvdir, entries=None):
+    """Get dictionary mapping names of CSV files in a result directory to [mtime, size]."""
+    files = {}
+    if entries is None:
+        entries = os.scandir(csvdir)
+    for entry in entries:
+        if entry.name.endswith('.csv') and entry.is_file():
+            st = entry.stat()
+            files[entry.name] = [st.st_mtime_ns, st.st_size]
+    return files
+
+
+def restat_files(csvdir, files):
+    """Get [mtime, size] of previously listed CSV files, or None if one of them was removed."""
+    stats = {}
+    for name in files:
+        try:
+            st = os.stat(os.path.join(csvdir, name))
+        except OSError:
+            return None
+        stats[name] = [st.st_mtime_ns, st.st_size]
+    return stats
+
+
+def get_catalog(dataset, regid, refresh=True, full=False):
+    """Get index of result CSV files of a given dataset and regid.
+
+    The returned dictionary has the cfgid subdirectory names as keys, and an empty
+    string for CSV files which are not stored in a cfgid subdirectory. Each value is
+    a dictionary which maps the names of the CSV files in this directory to their
+    [mtime, size]. The index is kept in memory and in the 'catalog.json' file
+    of the columnar cache directory (see get_cachedir).
+
+    When 'refresh' is True, the result directory is scanned again, but CSV files are
+    only listed in those subdirectories whose modification time changed, i.e., when
+    files were added, removed, or renamed. The CSV files listed in other subdirectories
+    are stat'ed again, such that files which were rewritten in place are detected as well.
+    With 'full=True', all subdirectories are listed again.
+
+    """
+    key = (topdir, dataset, regid)
+    path = os.path.join(get_cachedir(dataset, regid), 'catalog.json')
+    catalog = _catalogs.get(key)
+    if catalog is None:
+        try:
+            with open(path, 'r') as f:
+                catalog = json.load(f)
+            if catalog.get('version') != cache_version:
+                catalog = None
+        except (IOError, OSError, ValueError):
+            catalog = None
+        if catalog is None:
+            catalog = {'version': cache_version, 'dirs': {}}
+            refresh = True
+        _catalogs[key] = catalog
+    if refresh or full:
+        csvdir = get_csvdir(dataset, regid)
+        dirs = {}
+        modified = False
+        if os.path.isdir(csvdir):
+            re_cfgid = re.compile(r'^[0-9]+$')
+            files = []
+            subdirs = [('', os.stat(csvdir).st_mtime_ns, csvdir)]
+            for entry in os.scandir(csvdir):
+                if re_cfgid.match(entry.name) and entry.is_dir():
+                    subdirs.append((entry.name, entry.stat().st_mtime_ns, entry.path))
+                else:
+                    files.append(entry)
+            for name, mtime, subdir in subdirs:
+                info = catalog['dirs'].get(name)
+                if not full and info is not None and info['mtime'] == mtime:
+                    stats = restat_files(subdir, info['files'])
+                    if stats is None:
+                        info = None
+                    elif stats != info['files']:
+                        info = {'mtime': mtime, 'files': stats}
+                        modified = True
+                if full or info is None or info['mtime'] != mtime:
+                    info = {'mtime': mtime, 'files': scan_csvdir(subdir, files if name == '' else None)}
+                    modified = True
+                dirs[name] = info
+        if modified or len(dirs) != len(catalog['dirs']):
+            catalog['dirs'] = dirs
+            cachedir = os.path.dirname(path)
+            if not os.path.isdir(cachedir):
+                os.makedirs(cachedir)
+            tmp_path = '{}.{}.tmp'.format(path, os.getpid())
+            with open(tmp_path, 'w') as f:
+                json.dump(catalog, f)
+            os.replace(tmp_path, path)
+    return dict((name, info['files']) for name, info in catalog['dirs'].items())
+
+
+def get_csvinfo(dataset, regid, measure, cfgid=None, catalog=None):
+    """Get sorted list of [name, mtime, size] of result CSV files read for a given measure."""
+    if measure == 'vox':
+        suffixes = ('-mean.csv', '-sdev.csv', '-size.csv')
+    elif measure == 'dsc':
+        suffixes = ('-dsc.csv',)
+    elif measure == 'mice' or measure == 'mte':
+        suffixes = None
+    else:
+        suffixes = ('-' + measure + '.csv',)
+    if catalog is None:
+        catalog = get_catalog(dataset, regid)
+    info = []
+    for name, stat in catalog.get(cfgidstr(cfgid) if cfgid else '', {}).items():
+        if suffixes is None:
+            match = (name == measure + '.csv')
+        else:
+            match = name.endswith(suffixes)
+        if match:
+            info.append([name] + stat)
+    info.sort()
+    return info
+
+
+def read_cached(measure, dataset, regid, cfgid, read, catalog=None):
+    """Read result table from columnar cache, or call read(catalog) and update the cache.
+
+    The cached table of a given measure is stored in Feather format together with
+    a JSON file listing the name, modification time, and size of each CSV file it
+    was created from, as well as the target IDs for which these were read. The cache
+    is rebuilt when any of these source files has been added, removed, or modified since.
+    The CSV files of the cfgid are stat'ed again, also when a 'catalog' is given, and
+    the resulting catalog is passed to read() such that the table is read from the
+    same files which are listed in the JSON file.
+
+    """
+    if feather is None:
+        raise ImportError("Columnar result cache requires the 'pyarrow' package")
+    if catalog is None:
+        catalog = get_catalog(dataset, regid)
+    csvdir = get_csvdir(dataset, regid, cfgid=cfgid)
+    catalog = dict(catalog)
+    catalog[cfgidstr(cfgid) if cfgid else ''] = scan_csvdir(csvdir) if os.path.isdir(csvdir) else {}
+    csvinfo = get_csvinfo(dataset, regid, measure, cfgid=cfgid, catalog=catalog)
+    if not csvinfo:
+        return pd.DataFrame()
+    cachedir = get_cachedir(dataset, regid, cfgid=cfgid)
+    data_path = os.path.join(cachedir, measure + '.feather')
+    info_path = os.path.join(cachedir, measure + '.json')
+    info = {'version': cache_version, 'files': csvinfo}
+    if measure != 'mice' and measure != 'mte':
+        info['tgtids'] = get_tgtids(dataset, regid, cfgid, catalog=catalog)
+    try:
+        with open(info_path, 'r') as f:
+            if json.load(f) == info:
+                return feather.read_feather(data_path, memory_map=True)
+    except (IOError, OSError, ValueError):
+        pass
+    df = read(catalog)
+    df.reset_index(drop=True, inplace=True)
+    if not os.path.isdir(cachedir):
+        os.makedirs(cachedir)
+    tmp_path = '{}.{}.tmp'.format(data_path, os.getpid())
+    feather.write_feather(df, tmp_path, compression='uncompressed')
+    os.replace(tmp_path, data_path)
+    tmp_path = '{}.{}.tmp'.format(info_path, os.getpid())
+    with open(tmp_path, 'w') as f:
+        json.dump(info, f)
+    os.replace(tmp_path, info_path)
+    return df
+
+
+def get_cfgids(dataset, regid, catalog=None):
     """Get list of IDs of registration parameter sets."""
-    re_cfgid = re.compile(r'^[0-9]+$')
-    cfgids = [int(d) for d in os.listdir(get_csvdir(dataset, regid)) if re_cfgid.match(d)]
+    if catalog is None:
+        catalog = get_catalog(dataset, regid)
+    cfgids = [int(d) for d in catalog if d]
     cfgids.sort()
     return cfgids
 
 
-def get_tgtids(dataset, regid, cfgid=None):
+def get_tgtids(dataset, regid, cfgid=None, catalog=None):
     """Get list of target image IDs."""
+    if catalog is None:
+        catalog = get_catalog(dataset, regid)
     tgtids = set()
     re_tgtid = re.compile(r'^([^-]+)-[a-zA-Z0-9]+\.csv$')
-    csvdir = get_csvdir(dataset, regid, cfgid=cfgid)
-    for d in os.listdir(csvdir):
+    for d in catalog.get(cfgidstr(cfgid) if cfgid else '', {}):
         m = re_tgtid.match(d)
         if m:
             tgtids.add(m.group(1))
@@ -89,79 +350,338 @@ def get_tgtids(dataset, regid, cfgid=None):
     return tgtids
 
 
-def get_params(dataset, regid=None, toolkit=None, command=None, version=None, cfgid=None):
-    """Get table of registration parameter sets."""
-    if not dataset:
-        raise ValueError("Need to specify at least one evaluation 'dataset'")
-    if not regid and not toolkit:
-        raise ValueError("Either 'regid' or at least 'toolkit' must be specified")
-    df = pd.DataFrame()
-    # recursion for iterable arguments
-    if is_iterable(dataset):
-        for arg in dataset:
-            df = pd.concat([df, get_params(dataset=arg, regid=regid, toolkit=toolkit, command=command, version=version, cfgid=cfgid)])
-        return df
+def expand_regids(regid=None, toolkit=None, command=None, version=None):
+    """Get list of unique (regid, toolkit, command, version) tuples for given registration arguments.
+
+    The 'regid' can be a single ID, a list of IDs, or a dictionary with toolkit IDs as keys.
+    The values of this dictionary are either command IDs or dictionaries which map commands
+    to versions. Alternatively, 'toolkit', 'command', and 'version' can be specified, where
+    each of these can be a list, and 'command' and 'version' can be dictionaries keyed by
+    toolkit and "toolkit-command" ID, respectively.
+
+    """
     if isinstance(regid, dict):
         toolkit = list(regid.keys())
         command = {}
         version = {}
         for tk in toolkit:
-            command[tk] = {}
             if isinstance(regid[tk], dict):
                 command[tk] = list(regid[tk].keys())
                 for cmd in regid[tk]:
-                    k = get_regid(toolkit=tk, command=cmd)
-                    version[k] = regid[tk][cmd]
+                    version[get_regid(toolkit=tk, command=cmd)] = regid[tk][cmd]
             else:
                 command[tk] = regid[tk]
         regid = None
-    if is_iterable(regid):
-        for arg in regid:
-            df = pd.concat([df, get_params(dataset=dataset, regid=arg, toolkit=toolkit, command=command, version=version, cfgid=cfgid)])
-        return df
-    if is_iterable(toolkit):
-        for arg in toolkit:
-            df = pd.concat([df, get_params(dataset=dataset, regid=regid, toolkit=arg, command=command, version=version, cfgid=cfgid)])
-        return df
-    if isinstance(command, dict):
-        command = command[toolkit]
-    if is_iterable(command):
-        for arg in command:
-            df = pd.concat([df, get_params(dataset=dataset, regid=regid, toolkit=toolkit, command=arg, version=version, cfgid=cfgid)])
-        return df
-    if isinstance(version, dict):
-        version = version[get_regid(toolkit=toolkit, command=command)]
-    if is_iterable(version):
-        for arg in version:
-            df = pd.concat([df, get_params(dataset=dataset, regid=regid, toolkit=toolkit, command=command, version=arg, cfgid=cfgid)])
-        return df
-    # all arguments are non-iterable
+    regids = []
     if regid:
-        toolkit, command, version = split_regid(regid)
+        for arg in (regid if is_iterable(regid) else [regid]):
+            toolkit_id, command_id, version_id = split_regid(arg)
+            regids.append((arg, toolkit_id, command_id, version_id))
+    else:
+        for tk in (toolkit if is_iterable(toolkit) else [toolkit]):
+            commands = command.get(tk) if isinstance(command, dict) else command
+            for cmd in (commands if is_iterable(commands) else [commands]):
+                if isinstance(version, dict):
+                    versions = version.get(get_regid(toolkit=tk, command=cmd))
+                else:
+                    versions = version
+                for ver in (versions if is_iterable(versions) else [versions]):
+                    regids.append((get_regid(toolkit=tk, command=cmd, version=ver), tk, cmd, ver))
+    unique = []
+    for arg in regids:
+        if arg not in unique:
+            unique.append(arg)
+    return unique
+
+
+def expand_query(dataset, regid=None, toolkit=None, command=None, version=None):
+    """Get list of unique (dataset, regid, toolkit, command, version) tuples to read results for."""
+    if not dataset:
+        raise ValueError("Need to specify at least one evaluation 'dataset'")
+    if not regid and not toolkit:
+        raise ValueError("Either 'regid' or at least 'toolkit' must be specified")
+    datasets = []
+    for arg in (dataset if is_iterable(dataset) else [dataset]):
+        if arg not in datasets:
+            datasets.append(arg)
+    regids = expand_regids(regid=regid, toolkit=toolkit, command=command, version=version)
+    return [(arg,) + reg for arg in datasets for reg in regids]
+
+
+def select_cfgids(cfgid, dataset, regid):
+    """Get list of cfgids selected for a given dataset and regid.
+
+    The 'cfgid' argument can be a single ID, a list of IDs, or a dictionary with regid
+    as keys whose values are either cfgid(s) or a dictionary keyed by dataset. A list
+    with None as only element is returned when no cfgid is selected.
+
+    """
+    if isinstance(cfgid, dict):
+        cfgid = cfgid.get(regid)
+        if isinstance(cfgid, dict):
+            cfgid = cfgid.get(dataset)
+    if cfgid is None:
+        return [None]
+    if is_iterable(cfgid):
+        cfgids = []
+        for arg in cfgid:
+            if arg not in cfgids:
+                cfgids.append(arg)
+        return cfgids if cfgids else [None]
+    return [cfgid]
+
+
+def leaf_csvname(measure, tgtid, files):
+    """Get name of CSV file read for a given measure and target, or None if it is not in 'files'."""
+    if measure == 'vox':
+        names = [tgtid + '-mean.csv']
+    elif measure == 'dsc':
+        names = [tgtid + '-seg-dsc.csv', tgtid + '-dsc.csv']
+    elif measure == 'mice' or measure == 'mte':
+        names = [measure + '.csv']
+    else:
+        names = [tgtid + '-' + measure + '.csv']
+    for name in names:
+        if name in files:
+            return name
+    return None
+
+
+def plan_reads(measure, query, cfgid=None, tgtid=None, catalogs=None, refresh=True):
+    """Get flat list of unique (measure, dataset, regid, toolkit, command, version, cfgid, tgtid, path) leaf reads.
+
+    Each leaf corresponds to one CSV file (or set of CSV files, in case of 'vox'),
+    which are read by read_leaf. Target IDs and file paths are looked up in the catalog
+    of result files (see get_catalog), such that leaves of results which do not exist
+    are omitted without accessing the file system. The optional 'catalogs' dictionary
+    is used to look up and store the catalog of each (dataset, regid) such that result
+    directories are scanned only once when multiple measures are read.
+
+    """
+    if catalogs is None:
+        catalogs = {}
+    leaves = []
+    seen = set()
+    for dataset, regid, toolkit, command, version in query:
+        key = (dataset, regid)
+        if key not in catalogs:
+            catalogs[key] = get_catalog(dataset, regid, refresh=refresh)
+        catalog = catalogs[key]
+        for cfg in select_cfgids(cfgid, dataset, regid):
+            files = catalog.get(cfgidstr(cfg) if cfg else '', {})
+            if measure == 'mice' or measure == 'mte':
+                if is_iterable(tgtid):
+                    args = [tuple(tgtid)]
+                else:
+                    args = [tgtid]
+            elif tgtid:
+                args = tgtid if is_iterable(tgtid) else [tgtid]
+            else:
+                args = get_tgtids(dataset, regid, cfg, catalog=catalog)
+            for arg in args:
+                name = leaf_csvname(measure, arg, files)
+                if name is None:
+                    continue
+                path = os.path.join(get_csvdir(dataset, regid, cfgid=cfg), name)
+                leaf = (measure, dataset, regid, toolkit, command, version, cfg, arg, path)
+                if leaf not in seen:
+                    seen.add(leaf)
+                    leaves.append(leaf)
+    return leaves
+
+
+def leaf_usecols(measure, columns=None, label=None):
+    """Get set of names of CSV columns to read for a given measure, or None to read all columns."""
+    if measure == 'dsc':
+        if label is None:
+            return None
+        names = [str(l) for l in (label if is_iterable(label) else [label])]
+    else:
+        if columns is None:
+            return None
+        names = list(columns if is_iterable(columns) else [columns])
+        if measure == 'time':
+            names.extend([old for old, new in legacy_time_columns.items() if new in names])
+    return set(names + ['roi', 'srcid', 'tgtid'])
+
+
+def read_leaf(leaf, columns=None, srcid=None, label=None):
+    """Read result table of a single leaf returned by plan_reads.
+
+    When specified, only the measure 'columns', the columns of the given segmentation
+    'label' in case of overlap tables, and the rows of the given source images 'srcid'
+    are kept. Column selections are passed on to pandas.read_csv as 'usecols'.
+
+    """
+    measure, dataset, regid, toolkit, command, version, cfgid, tgtid, csv_path = leaf
+    names = leaf_usecols(measure, columns=columns, label=label)
+    usecols = None if names is None else names.__contains__
+    if measure == 'vox':
+        csv_prefix = csv_path[:-len('-mean.csv')]
+        dm = pd.read_csv(csv_prefix + '-mean.csv', header=0, usecols=usecols)
+        ds = pd.read_csv(csv_prefix + '-sdev.csv', header=0, usecols=usecols)
+        dn = pd.read_csv(csv_prefix + '-size.csv', header=0, usecols=usecols)
+        df = pd.merge(dm, ds, how='inner', on='roi', suffixes=('_mean', '_sdev'), copy=False)
+        df = pd.merge(df, dn, how='inner', on='roi', suffixes=('_mean', '_sdev'), copy=False)
     else:
-        regid = get_regid(toolkit=toolkit, command=command, version=version)
-    parcsv = None
+        try:
+            df = pd.read_csv(csv_path, header=0, dtype={'srcid': str, 'tgtid': str, 'host': str}, usecols=usecols)
+        except Exception as e:
+            sys.stderr.write("Failed to read CSV file: {}\n".format(csv_path))
+            raise e
+        if measure == 'time':
+            # columns missing in tables of previous versions are filled with NaN
+            df = df.rename(columns=legacy_time_columns)
+            df = df.reindex(columns=[c for c in time_columns if names is None or c in names])
+        if srcid is not None and 'srcid' in df:
+            ids = df.srcid
+            if measure == 'dsc':
+                ids = ids.str.split('-', n=1).str[0]
+            df = df[ids.isin([str(i) for i in (srcid if is_iterable(srcid) else [srcid])])].copy()
+    # insert columns in reverse order
+    if measure == 'mice' or measure == 'mte':
+        if isinstance(tgtid, tuple):
+            df = df[df.tgtid.isin(tgtid)].copy()
+        elif tgtid:
+            df = df[df.tgtid==tgtid].copy()
+    else:
+        df.insert(0, 'tgtid', tgtid)
+    if cfgid:
+        df.insert(0, 'cfgid', int(cfgid))
+    df.insert(0, 'version', version)
+    df.insert(0, 'command', command)
+    df.insert(0, 'toolkit', toolkit)
+    df.insert(0, 'regid', regid)
+    df.insert(0, 'dataset', dataset)
+    return df
+
+
+def read_leaves(leaves, max_workers=1, executor='thread', columns=None, srcid=None, label=None):
+    """Read and concatenate result tables of given leaf reads.
+
+    When 'max_workers' is not 1, the CSV files are read concurrently using either a pool
+    of threads ('thread', suited for I/O bound reads from network file systems) or of
+    processes ('process', for large tables where parsing dominates). A given instance of
+    concurrent.futures.Executor is used as is. When 'max_workers' is None, the default
+    number of workers of the respective executor is used. Rows are concatenated in the
+    order of the leaves independent of the order in which the reads complete.
+    The optional 'columns', 'srcid', and 'label' filters are applied by read_leaf.
+
+    """
+    read = read_leaf
+    if columns is not None or srcid is not None or label is not None:
+        read = functools.partial(read_leaf, columns=columns, srcid=srcid, label=label)
+    if len(leaves) < 2 or (max_workers == 1 and not isinstance(executor, concurrent.futures.Executor)):
+        dfs = [read(leaf) for leaf in leaves]
+    elif isinstance(executor, concurrent.futures.Executor):
+        dfs = list(executor.map(read, leaves))
+    elif executor == 'thread':
+        with concurrent.futures.ThreadPoolExecutor(max_workers=max_workers) as pool:
+            dfs = list(pool.map(read, leaves))
+    elif executor == 'process':
+        with concurrent.futures.ProcessPoolExecutor(max_workers=max_workers) as pool:
+            chunksize = max(1, len(leaves) // (4 * (max_workers or os.cpu_count() or 1)))
+            dfs = list(pool.map(read, leaves, chunksize=chunksize))
+    else:
+        raise ValueError("Invalid 'executor', must be 'thread', 'process', or concurrent.futures.Executor")
+    if not dfs:
+        return pd.DataFrame()
+    return pd.concat(dfs)
+
+
+def read_params_csv(csv_path):
+    """Read table of registration parameter sets from CSV file, or get cached copy if file is unchanged."""
+    mtime = os.stat(csv_path).st_mtime_ns
+    entry = _params.get(csv_path)
+    if entry is None or entry[0] != mtime:
+        df = pd.read_csv(csv_path)
+        if 'cfgid' in df:
+            df['cfgid'] = df.cfgid.astype(np.int64)
+        entry = (mtime, df)
+        _params[csv_path] = entry
+    return entry[1]
+
+
+def get_params_registry(refresh=True):
+    """Get all tables of registration parameter sets in etc/params.
+
+    The returned dictionary maps (dataset, name) to the parameter table read from
+    'etc/params/<dataset>/<name>.csv', where dataset is an empty string for the
+    default parameters in 'etc/params/<name>.csv'. Each CSV file is read only once,
+    and again after it was modified. When 'refresh' is False, the previously found
+    CSV files are used without listing the 'etc/params' directories again.
+
+    """
+    global _params_files
+    pardir = os.path.join(topdir, 'etc', 'params')
+    if refresh or _params_files is None or _params_files[0] != pardir:
+        files = {}
+        for root, dirs, names in os.walk(pardir):
+            subdir = os.path.relpath(root, pardir)
+            if subdir == os.curdir:
+                subdir = ''
+            for name in names:
+                if name.endswith('.csv'):
+                    files[(subdir, name[:-4])] = os.path.join(root, name)
+        _params_files = (pardir, files)
+    tables = {}
+    for key, csv_path in _params_files[1].items():
+        try:
+            tables[key] = read_params_csv(csv_path)
+        except (IOError, OSError):
+            pass
+    return tables
+
+
+def get_params_schema(tables=None):
+    """Get common type of each column of the tables of registration parameter sets.
+
+    Columns which are integral in some and floating point in other tables are of type
+    float64, and columns with non-numeric values in any table are of type object.
+
+    """
+    if tables is None:
+        tables = get_params_registry(refresh=False)
+    if isinstance(tables, dict):
+        tables = tables.values()
+    schema = {}
+    for df in tables:
+        for column in df.columns:
+            dtype = df[column].dtype
+            if dtype.kind not in 'biuf':
+                dtype = np.dtype(object)
+            if column in schema and schema[column] != dtype:
+                if schema[column].kind in 'biuf' and dtype.kind in 'biuf':
+                    dtype = np.result_type(schema[column], dtype, np.float64)
+                else:
+                    dtype = np.dtype(object)
+            schema[column] = dtype
+    return schema
+
+
+def read_params_table(dataset, regid, toolkit=None, command=None, version=None, cfgid=None, registry=None):
+    """Get table of registration parameter sets for a single dataset and regid."""
+    if toolkit is None:
+        toolkit, command, version = split_regid(regid)
+    if registry is None:
+        registry = get_params_registry()
+    df = None
     for name in (regid, get_regid(toolkit=toolkit, command=command, version=None)):
         for subdir in (dataset, ''):
-            pardir = os.path.join(topdir, "etc", "params")
-            if subdir:
-                pardir = os.path.join(pardir, subdir)
-            parcsv = os.path.join(pardir, regid + ".csv")
-            if os.path.exists(parcsv):
+            df = registry.get((subdir, name))
+            if df is not None:
                 break
-            parcsv = None
-        if parcsv is not None:
+        if df is not None:
             break
     if isinstance(cfgid, dict):
         cfgid = cfgid.get(regid, None)
-    if parcsv is None:
+    if df is None:
         df = pd.DataFrame({'cfgid': pd.Series([1])})
-    else:
-        df = pd.read_csv(parcsv)
-        if is_iterable(cfgid):
-            df = df[df.cfgid.isin([int(i) for i in cfgid])].copy()
-        elif cfgid is not None:
-            df = df[df.cfgid==int(cfgid)].copy()
+    elif is_iterable(cfgid):
+        df = df[df.cfgid.isin([int(i) for i in cfgid])]
+    elif cfgid is not None:
+        df = df[df.cfgid==int(cfgid)]
+    df = df.copy()
     df.insert(0, 'dataset', dataset)
     df.insert(1, 'regid', regid)
     df.insert(2, 'toolkit', toolkit)
@@ -170,323 +690,315 @@ def get_params(dataset, regid=None, toolkit=None, command=None, version=None, cf
     return df
 
 
+def get_params(dataset, regid=None, toolkit=None, command=None, version=None, cfgid=None):
+    """Get table of registration parameter sets."""
+    query = expand_query(dataset, regid=regid, toolkit=toolkit, command=command, version=version)
+    registry = get_params_registry()
+    df = pd.concat([read_params_table(*args, cfgid=cfgid, registry=registry) for args in query])
+    schema = get_params_schema(registry)
+    return df.astype(dict((c, schema[c]) for c in df.columns if c in schema and df[c].notnull().all()))
+
+
 def read_params(dataset, regid=None, toolkit=None, command=None, version=None, cfgid=None):
     return get_params(dataset, regid, toolkit, command, version, cfgid)
 
 
-def read_average_measures(dataset, regid=None, toolkit=None, command=None, version=None, tgtid=None, cfgid=None):
+def read_average_measures(dataset, regid=None, toolkit=None, command=None, version=None, tgtid=None, cfgid=None, max_workers=1, executor='thread', refresh=True):
     """Auxiliary function to read output tables of MIRTK 'average-measures' command."""
-    if not dataset:
-        raise ValueError("Need to specify at least one evaluation 'dataset'")
-    if not regid and not toolkit:
-        raise ValueError("Either 'regid' or at least 'toolkit' must be specified")
-    df = pd.DataFrame()
-    # recursion for iterable arguments
-    if is_iterable(dataset):
-        for arg in dataset:
-            df = pd.concat([df, read_average_measures(dataset=arg, regid=regid, toolkit=toolkit, command=command, version=version, tgtid=tgtid, cfgid=cfgid)])
-        return df
-    if isinstance(regid, dict):
-        toolkit = list(regid.keys())
-        command = {}
-        version = {}
-        for tk in toolkit:
-            command[tk] = {}
-            if isinstance(regid[tk], dict):
-                command[tk] = list(regid[tk].keys())
-                for cmd in regid[tk]:
-                    k = get_regid(toolkit=tk, command=cmd)
-                    version[k] = regid[tk][cmd]
-            else:
-                command[tk] = regid[tk]
-        regid = None
-    if is_iterable(regid):
-        for arg in regid:
-            df = pd.concat([df, read_average_measures(dataset=dataset, regid=arg, toolkit=toolkit, command=command, version=version, tgtid=tgtid, cfgid=cfgid)])
-        return df
-    if is_iterable(toolkit):
-        for arg in toolkit:
-            df = pd.concat([df, read_average_measures(dataset=dataset, regid=regid, toolkit=arg, command=command, version=version, tgtid=tgtid, cfgid=cfgid)])
-        return df
-    if isinstance(command, dict):
-        command = command[toolkit]
-    if is_iterable(command):
-        for arg in command:
-            df = pd.concat([df, read_average_measures(dataset=dataset, regid=regid, toolkit=toolkit, command=arg, version=version, tgtid=tgtid, cfgid=cfgid)])
-        return df
-    if isinstance(version, dict):
-        version = version[get_regid(toolkit=toolkit, command=command)]
-    if is_iterable(version):
-        for arg in version:
-            df = pd.concat([df, read_average_measures(dataset=dataset, regid=regid, toolkit=toolkit, command=command, version=arg, tgtid=tgtid, cfgid=cfgid)])
-        return df
-    if is_iterable(cfgid):
-        for arg in cfgid:
-            df = pd.concat([df, read_average_measures(dataset=dataset, regid=regid, toolkit=toolkit, command=command, version=version, tgtid=tgtid, cfgid=arg)])
-        return df
-    # all but tgtid non-iterable
-    if not tgtid:
-        tgtid = get_tgtids(dataset, regid, cfgid)
-    if is_iterable(tgtid):
-        for arg in tgtid:
-            df = pd.concat([df, read_average_measures(dataset=dataset, regid=regid, toolkit=toolkit, command=command, version=version, tgtid=arg, cfgid=cfgid)])
-        return df
-    # all arguments are non-iterable
-    if regid:
-        toolkit, command, version = split_regid(regid)
-    else:
-        regid = get_regid(toolkit=toolkit, command=command, version=version)
-    csv_prefix = os.path.join(get_csvdir(dataset, regid, cfgid=cfgid), tgtid)
-    if os.path.isfile(csv_prefix + '-mean.csv'):
-        dm = pd.read_csv(csv_prefix + '-mean.csv', header=0)
-        ds = pd.read_csv(csv_prefix + '-sdev.csv', header=0)
-        dn = pd.read_csv(csv_prefix + '-size.csv', header=0)
-        df = pd.merge(dm, ds, how='inner', on='roi', suffixes=('_mean', '_sdev'), copy=False)
-        df = pd.merge(df, dn, how='inner', on='roi', suffixes=('_mean', '_sdev'), copy=False)
-        # insert columns in reverse order
-        df.insert(0, 'tgtid', tgtid)
-        if cfgid:
-            df.insert(0, 'cfgid', int(cfgid))
-        df.insert(0, 'version', version)
-        df.insert(0, 'command', command)
-        df.insert(0, 'toolkit', toolkit)
-        df.insert(0, 'regid', regid)
-        df.insert(0, 'dataset', dataset)  
-    return df
+    query = expand_query(dataset, regid=regid, toolkit=toolkit, command=command, version=version)
+    leaves = plan_reads('vox', query, cfgid=cfgid, tgtid=tgtid, refresh=refresh)
+    return read_leaves(leaves, max_workers=max_workers, executor=executor)
 
 
-def read_measurements(measure, dataset, regid=None, toolkit=None, command=None, version=None, tgtid=None, cfgid=None):
+def read_measurements(measure, dataset, regid=None, toolkit=None, command=None, version=None, tgtid=None, cfgid=None, max_workers=1, executor='thread', refresh=True):
     """Read pairwise registration measurements."""
     if not measure:
         raise ValueError("Need to specify at least one evaluation 'measure'")
-    if not dataset:
-        raise ValueError("Need to specify at least one evaluation 'dataset'")
-    if not regid and not toolkit:
-        raise ValueError("Either 'regid' or at least 'toolkit' must be specified")
-    df = pd.DataFrame()
-    # recursion for iterable arguments
-    if is_iterable(measure):
-        for arg in measure:
-            df = pd.concat([df, read_measurements(measure=arg, dataset=dataset, regid=regid, toolkit=toolkit, command=command, version=version, tgtid=tgtid, cfgid=cfgid)])
-        return df
-    if is_iterable(dataset):
-        for arg in dataset:
-            df = pd.concat([df, read_measurements(measure=measure, dataset=arg, regid=regid, toolkit=toolkit, command=command, version=version, tgtid=tgtid, cfgid=cfgid)])
-        return df
-    if isinstance(regid, dict):
-        toolkit = list(regid.keys())
-        command = {}
-        version = {}
-        for tk in toolkit:
-            command[tk] = {}
-            if isinstance(regid[tk], dict):
-                command[tk] = list(regid[tk].keys())
-                for cmd in regid[tk]:
-                    k = get_regid(toolkit=tk, command=cmd)
-                    version[k] = regid[tk][cmd]
+    query = expand_query(dataset, regid=regid, toolkit=toolkit, command=command, version=version)
+    leaves = []
+    catalogs = {}
+    for arg in (measure if is_iterable(measure) else [measure]):
+        leaves.extend(plan_reads(arg, query, cfgid=cfgid, tgtid=tgtid, catalogs=catalogs, refresh=refresh))
+    return read_leaves(leaves, max_workers=max_workers, executor=executor)
+
+
+def get_categories(dfs):
+    """Get sorted categories of each ID column of given result tables.
+
+    The target and source image IDs share one set of categories, which is returned
+    for both 'tgtid' and 'srcid', such that these columns can be compared.
+
+    """
+    values = {}
+    for df in dfs:
+        for column in category_columns:
+            if column in df:
+                key = 'srcid' if column == 'tgtid' else column
+                if str(df[column].dtype) == 'category':
+                    values.setdefault(key, set()).update(df[column].cat.categories)
+                else:
+                    values.setdefault(key, set()).update(df[column].dropna().unique())
+    categories = {}
+    for key in values:
+        categories[key] = pd.Index(sorted(values[key]))
+    if 'srcid' in categories:
+        categories['tgtid'] = categories['srcid']
+    return categories
+
+
+def compact_dtypes(df, categories=None):
+    """Convert columns of result table to memory efficient types.
+
+    ID columns are converted to categoricals with the given 'categories' (see get_categories).
+    Tables with the same categories can be concatenated without converting these columns back
+    to objects. The 'cfgid' and numeric 'label' columns are converted to the smallest integer
+    type which can represent all values, and floating point measures to float32.
+
+    """
+    if categories is None:
+        categories = get_categories([df])
+    columns = {}
+    for column in df.columns:
+        values = df[column]
+        if column in categories:
+            values = pd.Categorical(values, categories=categories[column])
+        else:
+            if column == 'label' and values.dtype.kind == 'O':
+                try:
+                    values = pd.to_numeric(values)
+                except (ValueError, TypeError):
+                    values = values.astype('category')
+            kind = values.dtype.kind
+            if kind == 'i' or kind == 'u':
+                if column == 'cfgid' or column == 'label':
+                    values = pd.to_numeric(values, downcast='integer')
+            elif kind == 'f' and column != 'cfgid':
+                values = values.astype(np.float32)
+        columns[column] = values
+    return pd.DataFrame(columns, index=df.index)
+
+
+def get_result_cfgids(query, cfgid=None, catalogs=None, refresh=True):
+    """Get IDs of parameter sets whose results are read for each tuple returned by expand_query.
+
+    When 'cfgid' is None, all parameter sets with existing result directory are selected.
+
+    """
+    if catalogs is None:
+        catalogs = {}
+    cfgids = {}
+    for args in query:
+        dataset, regid = args[0:2]
+        if (dataset, regid) not in catalogs:
+            catalogs[(dataset, regid)] = get_catalog(dataset, regid, refresh=refresh)
+        if regid == 'affine':
+            cfgids[args] = None
+        elif cfgid is not None:
+            if isinstance(cfgid, dict):
+                cfgids[args] = cfgid[regid]
+                if isinstance(cfgids[args], dict):
+                    cfgids[args] = cfgids[args][dataset]
             else:
-                command[tk] = regid[tk]
-        regid = None
-    if is_iterable(regid):
-        for arg in regid:
-            df = pd.concat([df, read_measurements(measure=measure, dataset=dataset, regid=arg, toolkit=toolkit, command=command, version=version, tgtid=tgtid, cfgid=cfgid)])
-        return df
-    if is_iterable(toolkit):
-        for arg in toolkit:
-            df = pd.concat([df, read_measurements(measure=measure, dataset=dataset, regid=regid, toolkit=arg, command=command, version=version, tgtid=tgtid, cfgid=cfgid)])
-        return df
-    if isinstance(command, dict):
-        command = command[toolkit]
-    if is_iterable(command):
-        for arg in command:
-            df = pd.concat([df, read_measurements(measure=measure, dataset=dataset, regid=regid, toolkit=toolkit, command=arg, version=version, tgtid=tgtid, cfgid=cfgid)])
-        return df
-    if isinstance(version, dict):
-        version = version[get_regid(toolkit=toolkit, command=command)]
-    if is_iterable(version):
-        for arg in version:
-            df = pd.concat([df, read_measurements(measure=measure, dataset=dataset, regid=regid, toolkit=toolkit, command=command, version=arg, tgtid=tgtid, cfgid=cfgid)])
-        return df
-    if is_iterable(cfgid):
-        if len(cfgid) == 0:
-            cfgid = None
+                cfgids[args] = cfgid
         else:
-            for arg in cfgid:
-                df = pd.concat([df, read_measurements(measure=measure, dataset=dataset, regid=regid, toolkit=toolkit, command=command, version=version, tgtid=tgtid, cfgid=arg)])
-            return df
-    # all but tgtid non-iterable
-    if measure != 'mice' and measure != 'mte':
-        if not tgtid:
-            tgtid = get_tgtids(dataset, regid, cfgid)
-        if is_iterable(tgtid):
-            for arg in tgtid:
-                df = pd.concat([df, read_measurements(measure=measure, dataset=dataset, regid=regid, toolkit=toolkit, command=command, version=version, tgtid=arg, cfgid=cfgid)])
-            return df
-    # all arguments are non-iterable
-    if regid:
-        toolkit, command, version = split_regid(regid)
-    else:
-        regid = get_regid(toolkit=toolkit, command=command, version=version)
-    csvdir = get_csvdir(dataset, regid, cfgid=cfgid)
-    if measure == 'dsc':
-        csv_path = os.path.join(csvdir, tgtid + '-seg-' + measure + '.csv')
-        if not os.path.isfile(csv_path):
-            csv_path = os.path.join(csvdir, tgtid + '-' + measure + '.csv')
+            cfgids[args] = []
+            catalog = catalogs[(dataset, regid)]
+            for arg in read_params_table(*args).cfgid:
+                if cfgidstr(arg) in catalog:
+                    cfgids[args].append(arg)
+    return cfgids
+
+
+def melt_overlap(df, id_vars):
+    """Convert wide overlap table to long format with 'label' and 'dsc' columns.
+
+    The rows of each dataset and regid are melted separately and concatenated in the
+    order in which these occur in the wide table, i.e., the rows are ordered by dataset
+    and regid, then by label. Label columns without any value for a given dataset and
+    regid, i.e., labels of another dataset, are omitted.
+
+    """
+    keys = [column for column in ('dataset', 'regid') if column in id_vars]
+    if not keys or len(df) == 0:
+        return pd.melt(df, id_vars=id_vars, var_name='label', value_name='dsc')
+    codes = df.groupby(keys, sort=False, observed=True).ngroup().values
+    if codes.max() == 0:
+        return pd.melt(df, id_vars=id_vars, var_name='label', value_name='dsc')
+    parts = []
+    for code in range(codes.max() + 1):
+        part = df[codes == code]
+        value_vars = [column for column in part.columns if column not in id_vars and part[column].notna().any()]
+        parts.append(pd.melt(part, id_vars=id_vars, value_vars=value_vars, var_name='label', value_name='dsc'))
+    return pd.concat(parts, ignore_index=True)
+
+
+def finish_results(measure, df, compact=False):
+    """Add derived columns to table of results read for a given measure, and convert DSC table to long format."""
+    if measure == 'jac':
+        if 'nexcl' in df and 'n' in df and 'pctexcl' not in df:
+            df = df.assign(pctexcl=(100. * df.nexcl / (df.n + df.nexcl)))
     elif measure == 'mice' or measure == 'mte':
-        csv_path = os.path.join(csvdir, measure + '.csv')
-    else:
-        csv_path = os.path.join(csvdir, tgtid + '-' + measure + '.csv')
-    if os.path.isfile(csv_path):
-        try:
-            df = pd.read_csv(csv_path, header=0, dtype={'srcid': str, 'tgtid': str})
-        except Exception as e:
-            sys.stderr.write("Failed to read CSV file: {}\n".format(csv_path))
-            raise e
-        if measure == 'time':
-            replacements = {}
-            if 'cpu_time' in df:
-                replacements['cpu_time'] = 'user'
-            if 'wall_time' in df:
-                replacements['wall_time'] = 'real'
-            if replacements:
-                df.rename(columns=replacements, inplace=True)
-        # insert columns in reverse order
-        if measure == 'mice' or measure == 'mte':
-            if tgtid:
-                df = df[df.tgtid==tgtid].copy()
-        else:
-            df.insert(0, 'tgtid', tgtid)
-        if cfgid:
-            df.insert(0, 'cfgid', int(cfgid))
-        df.insert(0, 'version', version)
-        df.insert(0, 'command', command)
-        df.insert(0, 'toolkit', toolkit)
-        df.insert(0, 'regid', regid)
-        df.insert(0, 'dataset', dataset)   
-    return df
+        if 'nzero' in df and 'n' in df and 'pctzero' not in df:
+            df = df.assign(pctzero=(100. * df.nzero / df.n))
+    elif measure == 'dsc':
+        if 'srcid' in df:
+            df.srcid = df.srcid.map(lambda x: x.split('-')[0])
+            if 'tgtid' in df:
+                df = df[df.tgtid!=df.srcid]
+        id_vars = df.columns.intersection(['dataset', 'regid', 'toolkit', 'command', 'version', 'cfgid', 'tgtid', 'srcid']).tolist()
+        if compact:
+            df = compact_dtypes(df)
+        df = melt_overlap(df, id_vars)
+    if 'tgtid' in df and 'srcid' in df:
+        df = df[df.tgtid!=df.srcid]
+    if compact:
+        df = compact_dtypes(df)
+    return df.copy()
+
+
+def read_results(dataset, regid=None, toolkit=None, command=None, version=None, measure=['vox', 'dsc', 'jac', 'mice', 'time'], cfgid=None, cache=False, max_workers=1, executor='thread', refresh=True, compact=False):
+    """Read all results for a number of quality measures.
+
+    The cross product of the given arguments is first expanded into a flat list of
+    leaf reads (see plan_reads), and the tables of each measure are concatenated once.
+    When 'cfgid' is None, all parameter sets with existing result directory are read.
+    The CSV files are read by 'max_workers' concurrent workers (see read_leaves).
+
+    When 'cache' is True, the tables of each dataset, regid, cfgid, and measure are
+    read from a columnar cache (see read_cached) which is only updated when a CSV
+    file was added, removed, or modified since it was last written.
+
+    Result files are looked up in a persistent catalog of each result directory
+    (see get_catalog). When 'refresh' is False, the catalog is used as is without
+    checking the result directories for new files.
 
+    When 'compact' is True, the columns of the returned tables are converted to memory
+    efficient types (see compact_dtypes). The ID columns of all returned tables share
+    the same categories. By default, the columns are of type object and float64.
 
-def read_results(dataset, regid=None, toolkit=None, command=None, version=None, measure=['vox', 'dsc', 'jac', 'mice', 'time'], cfgid=None):
-    """Read all results for a number of quality measures."""
+    """
     if not measure:
         raise ValueError("Need to specify at least one evaluation 'measure'")
-    if not dataset:
-        raise ValueError("Need to specify at least one evaluation 'dataset'")
-    if not regid and not toolkit:
-        raise ValueError("Either 'regid' or at least 'toolkit' must be specified")
-    dfs = {}
-    # recursion for iterable arguments
-    if is_iterable(dataset):
-        for arg in dataset:
-            res = read_results(dataset=arg, regid=regid, toolkit=toolkit, command=command, version=version, measure=measure, cfgid=cfgid)
-            for m in res:
-                if m in dfs:
-                    dfs[m] = pd.concat([dfs[m], res[m]])
-                else:
-                    dfs[m] = res[m]
-        return dfs
-    if isinstance(regid, dict):
-        toolkit = list(regid.keys())
-        command = {}
-        version = {}
-        for tk in toolkit:
-            command[tk] = {}
-            if isinstance(regid[tk], dict):
-                command[tk] = list(regid[tk].keys())
-                for cmd in regid[tk]:
-                    k = get_regid(toolkit=tk, command=cmd)
-                    version[k] = regid[tk][cmd]
-            else:
-                command[tk] = regid[tk]
-        regid = None
-    if is_iterable(regid):
-        for arg in regid:
-            res = read_results(dataset=dataset, regid=arg, toolkit=toolkit, command=command, version=version, measure=measure, cfgid=cfgid)
-            for m in res:
-                if m in dfs:
-                    dfs[m] = pd.concat([dfs[m], res[m]])
-                else:
-                    dfs[m] = res[m]
-        return dfs
-    if is_iterable(toolkit):
-        for arg in toolkit:
-            res = read_results(dataset=dataset, regid=regid, toolkit=arg, command=command, version=version, measure=measure, cfgid=cfgid)
-            for m in res:
-                if m in dfs:
-                    dfs[m] = pd.concat([dfs[m], res[m]])
-                else:
-                    dfs[m] = res[m]
-        return dfs
-    if isinstance(command, dict):
-        command = command[toolkit]
-    if is_iterable(command):
-        for arg in command:
-            res = read_results(dataset=dataset, regid=regid, toolkit=toolkit, command=arg, version=version, measure=measure, cfgid=cfgid)
-            for m in res:
-                if m in dfs:
-                    dfs[m] = pd.concat([dfs[m], res[m]])
-                else:
-                    dfs[m] = res[m]
-        return dfs
-    if isinstance(version, dict):
-        version = version[get_regid(toolkit=toolkit, command=command)]
-    if is_iterable(version):
-        for arg in version:
-            res = read_results(dataset=dataset, regid=regid, toolkit=toolkit, command=command, version=arg, measure=measure, cfgid=cfgid)
-            for m in res:
-                if m in dfs:
-                    dfs[m] = pd.concat([dfs[m], res[m]])
-                else:
-                    dfs[m] = res[m]
-        return dfs
     if not is_iterable(measure):
         measure = [measure]
-    # all arguments are non-iterable, except for 'measure'
-    if not regid:
-        regid = get_regid(toolkit=toolkit, command=command, version=version)
-    if regid == 'affine':
-        cfgids = []
-    elif cfgid is not None:
-        if isinstance(cfgid, dict):
-            cfgids = cfgid[regid]
-            if isinstance(cfgids, dict):
-                cfgids = cfgids[dataset]
-        elif is_iterable(cfgid):
-            cfgids = list(cfgid)
-        else:
-            cfgids = [cfgid]
-    else:
-        cfgids = []
-        for cfgid in get_params(dataset, regid).cfgid:
-            if os.path.isdir(get_csvdir(dataset, regid, cfgid)):
-                cfgids.append(cfgid)
+    query = expand_query(dataset, regid=regid, toolkit=toolkit, command=command, version=version)
+    catalogs = {}
+    cfgids = get_result_cfgids(query, cfgid=cfgid, catalogs=catalogs, refresh=refresh)
+    dfs = {}
     for m in measure:
-        if m == 'vox':
-            df = read_average_measures(dataset=dataset, regid=regid, cfgid=cfgids)
-        elif m == 'jac':
-            df = read_measurements(measure='logjac', dataset=dataset, regid=regid, cfgid=cfgids)
-            if 'nexcl' in df and 'n' in df and 'pctexcl' not in df:
-                df = df.assign(pctexcl=(100. * df.nexcl / (df.n + df.nexcl)))
-        elif m == 'mice' or m == 'mte':
-            df = read_measurements(measure=m, dataset=dataset, regid=regid, cfgid=cfgids)
-            if 'nzero' in df and 'n' in df and 'pctzero' not in df:
-                df = df.assign(pctzero=(100. * df.nzero / df.n))
+        name = 'logjac' if m == 'jac' else m
+        if cache:
+            tables = []
+            for args in query:
+                for arg in select_cfgids(cfgids[args], *args[0:2]):
+                    read = lambda catalog: read_leaves(plan_reads(name, [args], cfgid=arg, catalogs={args[0:2]: catalog}), max_workers=max_workers, executor=executor)
+                    tables.append(read_cached(name, args[0], args[1], arg, read, catalog=catalogs[args[0:2]]))
+            tables = [df for df in tables if not df.empty]
+            df = pd.concat(tables, ignore_index=True) if tables else pd.DataFrame()
         else:
-            df = read_measurements(measure=m, dataset=dataset, regid=regid, cfgid=cfgids)
-            if m == 'dsc':
-                if 'srcid' in df:
-                    df.srcid = df.srcid.map(lambda x: x.split('-')[0])
-                id_vars = df.columns.intersection(['dataset', 'regid', 'toolkit', 'command', 'version', 'cfgid', 'tgtid', 'srcid']).tolist()
-                df = pd.melt(df, id_vars=id_vars, var_name='label', value_name='dsc')
-        if 'tgtid' in df and 'srcid' in df:
-            df = df[df.tgtid!=df.srcid]
-        dfs[m] = df.copy()
+            leaves = []
+            for args in query:
+                leaves.extend(plan_reads(name, [args], cfgid=cfgids[args], catalogs=catalogs))
+            df = read_leaves(leaves, max_workers=max_workers, executor=executor)
+        dfs[m] = finish_results(m, df, compact=compact)
+    if compact:
+        categories = get_categories(dfs.values())
+        for m in dfs:
+            dfs[m] = compact_dtypes(dfs[m], categories)
     return dfs
 
 
-def average_overlap(dfs, measure=None):
-    """Compute average overlap of those labels within a label group, and those that are not."""
+def iter_results(dataset, regid=None, toolkit=None, command=None, version=None, measure=['vox', 'dsc', 'jac', 'mice', 'time'], cfgid=None, tgtid=None, srcid=None, label=None, columns=None, max_workers=1, executor='thread', refresh=True, compact=True):
+    """Iterate over results of each dataset, regid, and cfgid.
+
+    Yields (measure, table) pairs, where each table contains the results of one measure
+    for a single dataset, registration method, and parameter set, such that only one
+    such table is held in memory at a time. Empty tables are skipped.
+
+    The given filters are applied while the CSV files are read: 'tgtid' selects which
+    files are read, 'srcid' which rows are kept, 'label' which columns of the overlap
+    tables are read before these are converted to long format, and 'columns' which
+    measure columns of the other tables are read (see read_leaf). Other arguments are
+    as for read_results. When 'compact' is True, the categories of the ID columns of
+    each table are those of this table only. Use get_categories and compact_dtypes
+    to convert tables which are concatenated to common categories.
+
+    """
+    if not measure:
+        raise ValueError("Need to specify at least one evaluation 'measure'")
+    if not is_iterable(measure):
+        measure = [measure]
+    query = expand_query(dataset, regid=regid, toolkit=toolkit, command=command, version=version)
+    catalogs = {}
+    cfgids = get_result_cfgids(query, cfgid=cfgid, catalogs=catalogs, refresh=refresh)
+    for args in query:
+        for arg in select_cfgids(cfgids[args], *args[0:2]):
+            for m in measure:
+                name = 'logjac' if m == 'jac' else m
+                leaves = plan_reads(name, [args], cfgid=arg, tgtid=tgtid, catalogs=catalogs)
+                if not leaves:
+                    continue
+                df = read_leaves(leaves, max_workers=max_workers, executor=executor, columns=columns, srcid=srcid, label=label)
+                df = finish_results(m, df, compact=compact)
+                if not df.empty:
+                    yield m, df
+
+
+def get_label_groups(dataset):
+    """Get pandas.Series of label group names indexed by label number, or None if dataset has no label table.
+
+    The groups are read from the 'Label Group: <name>' columns of the dataset CSV file,
+    where a label belongs to a group when marked by '+'. A label which is marked in more
+    than one column is assigned to the last group. Labels which are not part of any group
+    are omitted. The table is read only once, and again after the CSV file was modified.
+
+    """
+    csv_path = os.path.join(topdir, 'etc', 'dataset', dataset + '.csv')
+    try:
+        mtime = os.stat(csv_path).st_mtime_ns
+    except OSError:
+        return None
+    entry = _label_groups.get(csv_path)
+    if entry is None or entry[0] != mtime:
+        labels = pd.read_csv(csv_path, index_col=0, header=0)
+        groups = pd.Series(None, index=labels.index.astype(int), dtype=object)
+        for column in labels.columns:
+            if column.startswith('Label Group: '):
+                groups[(labels[column] == '+').values] = column[13:]
+        entry = (mtime, groups.dropna())
+        _label_groups[csv_path] = entry
+    return entry[1]
+
+
+def label_group_codes(df, names):
+    """Get index into sorted list of label group 'names' for each row of overlap table, or -1 if not in any group."""
+    codes = np.full(len(df), -1, dtype=np.int64)
+    datasets = df.dataset.values
+    for dataset in pd.unique(datasets):
+        groups = get_label_groups(dataset)
+        if groups is None:
+            sys.stderr.write('Missing: {}\n'.format(os.path.join(topdir, 'etc', 'dataset', dataset + '.csv')))
+            continue
+        mask = (datasets == dataset)
+        label_codes, labels = pd.factorize(df.label.values[mask])
+        labels = pd.to_numeric(labels).astype(int)
+        label_groups = groups.reindex(labels).values
+        lookup = np.full(len(labels), -1, dtype=np.int64)
+        ingroup = pd.notnull(label_groups)
+        lookup[ingroup] = np.searchsorted(names, label_groups[ingroup].astype(str))
+        codes[mask] = lookup[label_codes]
+    return codes
+
+
+def summarize_overlap(dfs, measure=None):
+    """Compute average overlap of labels within any label group, and within each label group, in a single pass.
+
+    Returns a tuple of the tables returned by average_overlap and average_group_overlap,
+    respectively. Both are computed from the same per-group sums and counts.
+
+    """
     avg = {}
+    group_avg = {}
     if measure is None and isinstance(dfs, pd.DataFrame):
         dfs = dict(dsc=dfs)
         measure = ['dsc']
@@ -497,73 +1009,43 @@ def average_overlap(dfs, measure=None):
     for m in dfs:
         if m in measure or is_overlap_measure(m):
             reg_info = dfs[m][['regid', 'toolkit', 'command', 'version']].drop_duplicates()
-            df = dfs[m].assign(ingroup=False)
-            datasets = df.dataset.unique()
-            for dataset in datasets:
-                csv_path = os.path.join(topdir, 'etc', 'dataset', dataset + '.csv')
-                if os.path.isfile(csv_path):
-                    label2group = {}
-                    labels = pd.read_csv(csv_path, index_col=0, header=0)
-                    for column in labels.columns:
-                        if column.startswith('Label Group: '):
-                            group = column[13:]
-                            for label in labels[labels[column]=='+'].index.tolist():
-                                label2group[int(label)] = group
-                    sub = df[df.dataset==dataset]
-                    col = sub.label.map(lambda l: int(l) in label2group)
-                    df.loc[df.dataset==dataset, 'ingroup'] = col
-                else:
-                    sys.stderr.write('Missing: {}'.format(csv_path))
-            id_vars = df.columns.intersection(['dataset', 'regid', 'cfgid', 'tgtid', 'srcid', 'ingroup']).tolist()
-            g = df.groupby(id_vars)
-            df = g.mean()  #.assign(count=g.size())
+            df = dfs[m]
+            names = set()
+            for dataset in df.dataset.unique():
+                groups = get_label_groups(dataset)
+                if groups is not None:
+                    names.update(groups.unique())
+            names = np.array(sorted(names), dtype=str)
+            id_vars = df.columns.intersection(['dataset', 'regid', 'cfgid', 'tgtid', 'srcid']).tolist()
+            values = [c for c in df.columns if c not in id_vars and c not in ('toolkit', 'command', 'version', 'label') and df[c].dtype.kind in 'biuf']
+            df = df[id_vars + values].reset_index(drop=True)
+            df['group'] = label_group_codes(dfs[m], names)
+            df = df[df.group >= 0]
+            g = df.groupby(id_vars + ['group'], observed=True)
+            total = g.sum()
+            count = g.count()
+            group_total = total.groupby(level=id_vars, observed=True).sum()
+            group_count = count.groupby(level=id_vars, observed=True).sum()
+            df = group_total / group_count
+            df.reset_index(drop=False, inplace=True)
+            avg[m] = df.merge(reg_info, on=['regid'])
+            df = total / count
             df.reset_index(drop=False, inplace=True)
-            avg[m] = df[df.ingroup==True].merge(reg_info, on=['regid'])
-            if 'ingroup' in avg[m]:
-                del avg[m]['ingroup']
+            df['group'] = names[df.group.values].astype(object)
+            group_avg[m] = df.merge(reg_info, on=['regid'])
     if len(measure) == 1 and measure[0] is not None:
-        return avg[measure[0]]
-    return avg
+        return avg[measure[0]], group_avg[measure[0]]
+    return avg, group_avg
+
+
+def average_overlap(dfs, measure=None):
+    """Compute average overlap of those labels within a label group, and those that are not."""
+    return summarize_overlap(dfs, measure)[0]
 
 
 def average_group_overlap(dfs, measure=None):
     """Compute average overlap of labels within each defined label group."""
-    avg = {}
-    if measure is None and isinstance(dfs, pd.DataFrame):
-        dfs = dict(dsc=dfs)
-        measure = ['dsc']
-    elif not is_iterable(measure):
-        if not isinstance(dfs, dict):
-            dfs = {measure: dfs}
-        measure = [measure]
-    for m in dfs:
-        if m in measure or is_overlap_measure(m):
-            reg_info = dfs[m][['regid', 'toolkit', 'command', 'version']].drop_duplicates()
-            df = dfs[m].assign(group=None)
-            datasets = df.dataset.unique()
-            for dataset in datasets:
-                csv_path = os.path.join(topdir, 'etc', 'dataset', dataset + '.csv')
-                if os.path.isfile(csv_path):
-                    label2group = {}
-                    labels = pd.read_csv(csv_path, index_col=0, header=0)
-                    for column in labels.columns:
-                        if column.startswith('Label Group: '):
-                            group = column[13:]
-                            for label in labels[labels[column]=='+'].index.tolist():
-                                label2group[int(label)] = group
-                    sub = df[df.dataset==dataset]
-                    col = sub.label.map(lambda l: label2group[int(l)] if int(l) in label2group else None)
-                    df.loc[df.dataset==dataset, 'group'] = col
-                else:
-                    sys.stderr.write('Missing: {}'.format(csv_path))
-            id_vars = df.columns.intersection(['dataset', 'regid', 'cfgid', 'tgtid', 'srcid', 'group']).tolist()
-            g = df.groupby(id_vars)
-            df = g.mean()  #.assign(count=g.size())
-            df.reset_index(drop=False, inplace=True)
-            avg[m] = df.merge(reg_info, on=['regid'])
-    if len(measure) == 1 and not measure[0] is None:
-        return avg[measure[0]]
-    return avg
+    return summarize_overlap(dfs, measure)[1]
 
 
 def set_params(df, params=None):
@@ -572,21 +1054,28 @@ def set_params(df, params=None):
         id_vars = df.columns.intersection(['dataset', 'regid', 'cfgid']).tolist()
         datasets = df.dataset.unique().tolist()
         regids = df.regid.unique().tolist()
-        result = pd.DataFrame()
-        for regid in regids:
-            for dataset in datasets:
-                if isinstance(params, pd.DataFrame):
-                    par = params[(params.dataset==dataset)&(params.regid==regid)]
-                elif isinstance(params, dict):
+        if isinstance(params, pd.DataFrame):
+            par = params
+        elif isinstance(params, dict):
+            tables = []
+            for regid in regids:
+                for dataset in datasets:
                     par = params[regid]
                     if isinstance(par, dict):
                         par = par[dataset]
-                else:
-                    par = get_params(dataset, regid)
-                par.set_index(id_vars, inplace=True)
-                col = par.columns.difference(df.columns)
-                result = pd.concat([result, pd.merge(df, par[col], left_on=id_vars, right_index=True, how='inner').reset_index(drop=True)])
-        return result
+                    tables.append(par)
+            par = pd.concat(tables)
+        else:
+            par = get_params(datasets, regids)
+        col = par.columns.difference(df.columns)
+        par = par[id_vars + col.tolist()].drop_duplicates(id_vars)
+        for column in id_vars:
+            if str(df[column].dtype) == 'category':
+                par[column] = pd.Categorical(par[column], categories=df[column].cat.categories)
+            elif df[column].dtype.kind in 'iu':
+                par = par[par[column].notnull()]
+                par[column] = par[column].astype(df[column].dtype)
+        return pd.merge(df, par, on=id_vars, how='inner')
     elif isinstance(df, dict):
         for m in df:
             df[m] = set_params(df[m])
@@ -600,23 +1089,404 @@ def set_params(df, params=None):
         raise ValueError("Argument must be pandas.DataFrame, dict, or iterable")
 
 
+def label_group_masks(labels, groups=None):
+    """Get list of (name, mask) pairs selecting the given label numbers within each label group.
+
+    The first entry is named '*' and selects all labels within any group of the pandas.Series
+    returned by get_label_groups. When no 'groups' are given, it selects all labels.
+
+    """
+    if groups is None or len(groups) == 0:
+        return [('*', np.ones(len(labels), dtype=bool))]
+    masks = [('*', np.isin(labels, groups.index.values))]
+    for name in sorted(groups.unique()):
+        masks.append((name, np.isin(labels, groups.index.values[groups.values == name])))
+    return masks
 
-#### TODO
 
-def read_label_volumes(dataset, regid, tgtid, cfgid=None):
-    """Get volumes of segmentation labels."""
-    unit = np.prod(spacing['alberts'])
-    prefix = get_registration_tables_dir(dataset, regid)
+def reduce_results(measure, df, groups=None):
+    """Reduce result table of a given measure to the values from which summarize_cfgid computes summary statistics.
+
+    The overlap table is reduced to the mean overlap of the labels within each label
+    group (see label_group_masks), and the table of voxel-wise measures to the mean of
+    the averages within the ROIs of these labels, i.e., ROIs named '<name>=<label>',
+    in columns named 'vox_<measure>'. The tables of the other measures are reduced
+    to the columns listed in summary_columns.
+
+    """
+    ids = [c for c in ('tgtid', 'srcid') if c in df]
+    if measure == 'vox':
+        labels = df.roi.str.extract(r'^[^=]+=([0-9]+)$', expand=False)
+        df = df[labels.notnull()]
+        labels = pd.to_numeric(labels[labels.notnull()]).values
+        columns = [c for c in df.columns if c.endswith('_mean')]
+        tables = []
+        for name, mask in label_group_masks(labels, groups):
+            table = df[mask].groupby('tgtid')[columns].mean()
+            table.columns = ['vox_' + c[:-5] for c in columns]
+            table.insert(0, 'group', name)
+            tables.append(table.reset_index())
+        if not tables:
+            return pd.DataFrame()
+        return pd.concat(tables, ignore_index=True)
+    if measure != 'dsc':
+        df = finish_results(measure, df)
+        columns = []
+        for _, arg, column, _ in summary_columns:
+            if arg == measure and column not in columns:
+                columns.append(column)
+        return df.reindex(columns=ids + columns).reset_index(drop=True)
+    id_columns = ['dataset', 'regid', 'toolkit', 'command', 'version', 'cfgid', 'tgtid', 'srcid']
+    labels = [c for c in df.columns if c not in id_columns]
+    numbers = pd.to_numeric(pd.Series(labels), errors='coerce').values
+    values = df[labels].values.astype(np.float64)
+    valid = ~np.isnan(values)
+    values = np.where(valid, values, 0.)
+    tgtids = df.tgtid.values.astype(str)
+    srcids = df.srcid.str.split('-', n=1).str[0].values.astype(str)
+    tables = []
+    for name, mask in label_group_masks(numbers, groups):
+        with np.errstate(divide='ignore', invalid='ignore'):
+            dsc = values[:, mask].sum(axis=1) / valid[:, mask].sum(axis=1)
+        tables.append(pd.DataFrame({'tgtid': tgtids, 'srcid': srcids, 'group': name, 'dsc': dsc}))
+    df = pd.concat(tables, ignore_index=True)
+    return df[df.tgtid != df.srcid].reset_index(drop=True)
+
+
+def summary_statistic(values, stat):
+    """Compute statistic of summary_columns of given pandas.Series or SeriesGroupBy, ignoring NaNs."""
+    if stat == 'pct5':
+        return values.quantile(.05)
+    if stat == 'pct95':
+        return values.quantile(.95)
+    return getattr(values, stat)()
+
+
+def summarize_values(values):
+    """Compute summary statistics of reduced result tables of a single parameter set.
+
+    Returns a table with one row for each label group of the reduced overlap and voxel-wise
+    measures tables, where statistics of the other measures are the same for each group.
+    The voxel-wise measures are averaged over all target images.
+
+    """
+    dsc = values.get('dsc')
+    vox = values.get('vox')
+    groups = set()
+    for table in (dsc, vox):
+        if table is not None and not table.empty:
+            groups.update(table.group.unique())
+    groups = sorted(groups) if groups else ['*']
+    if dsc is not None and not dsc.empty:
+        by_group = dsc.groupby('group')['dsc']
+    df = pd.DataFrame({'group': groups})
+    for name, measure, column, stat in summary_columns:
+        table = values.get(measure)
+        if table is None or table.empty:
+            df[name] = 0 if stat == 'count' else np.nan
+        elif measure == 'dsc':
+            df[name] = summary_statistic(by_group, stat).reindex(groups).values
+        else:
+            df[name] = summary_statistic(table[column], stat)
+    if vox is not None and not vox.empty:
+        df = df.join(vox.groupby('group')[[c for c in vox.columns if c.startswith('vox_')]].mean(), on='group')
+    return df
+
+
+def summarize_cfgid(query, cfgid=None, catalogs=None, max_workers=1, executor='thread'):
+    """Get summary statistics of the results of a single (dataset, regid, toolkit, command, version) and cfgid.
+
+    The reduced result tables (see reduce_results) and the statistics computed from
+    them (see summarize_values) are kept in memory and, when the 'pyarrow' package is
+    installed, in the columnar cache directory. When summaries are requested again,
+    only the result CSV files which were added or modified since are read, and the
+    reduced values of targets whose files were modified or removed are replaced.
+    The statistics are only recomputed when any result file or the label table of
+    the dataset changed. Changed files are looked up in the catalog of result files,
+    which is refreshed by summarize_results when 'refresh' is True.
+
+    """
+    dataset, regid, toolkit, command, version = query
+    if catalogs is None:
+        catalogs = {}
+    cfgdir = cfgidstr(cfgid) if cfgid else ''
+    key = (topdir, dataset, regid, cfgdir)
+    try:
+        labels = os.stat(os.path.join(topdir, 'etc', 'dataset', dataset + '.csv')).st_mtime_ns
+    except OSError:
+        labels = None
+    leaves = {}
+    files = {}
+    for measure in ('vox', 'dsc', 'jac', 'mice', 'time'):
+        leaves[measure] = plan_reads('logjac' if measure == 'jac' else measure, [query], cfgid=cfgid, catalogs=catalogs)
+        names = catalogs[(dataset, regid)].get(cfgdir, {})
+        files[measure] = dict((leaf[7] or '', [os.path.basename(leaf[8])] + names[os.path.basename(leaf[8])]) for leaf in leaves[measure])
+    cachedir = get_cachedir(dataset, regid, cfgid=cfgid)
+    info_path = os.path.join(cachedir, 'summary.json')
+    state = _summaries.get(key)
+    if state is None and feather is not None:
+        try:
+            with open(info_path, 'r') as f:
+                info = json.load(f)
+            if info.get('version') == cache_version:
+                state = {'labels': info['labels'], 'files': info['files'], 'values': {}}
+                for measure in info['files']:
+                    state['values'][measure] = feather.read_feather(os.path.join(cachedir, 'summary-' + measure + '.feather'))
+                state['summary'] = feather.read_feather(os.path.join(cachedir, 'summary.feather'))
+        except (IOError, OSError, ValueError, KeyError):
+            state = None
+    if state is None:
+        state = {'labels': None, 'files': {}, 'values': {}, 'summary': None}
+    if state['summary'] is None or state['labels'] != labels or state['files'] != files:
+        if state['labels'] != labels:
+            state['files'].pop('dsc', None)
+            state['values'].pop('dsc', None)
+        groups = get_label_groups(dataset)
+        for measure in files:
+            old = state['files'].get(measure, {})
+            new = files[measure]
+            if old == new:
+                continue
+            stale = set([tgtid for tgtid in old if old[tgtid] != new.get(tgtid)])
+            reads = [leaf for leaf in leaves[measure] if old.get(leaf[7] or '') != new[leaf[7] or '']]
+            values = state['values'].get(measure)
+            if values is not None and not values.empty and stale:
+                values = values[~values.tgtid.isin(stale)] if '' not in stale else None
+            if reads:
+                df = reduce_results(measure, read_leaves(reads, max_workers=max_workers, executor=executor), groups=groups)
+                values = df if values is None or values.empty else pd.concat([values, df], ignore_index=True)
+            state['values'][measure] = values if values is not None else pd.DataFrame()
+            state['files'][measure] = new
+        state['labels'] = labels
+        state['summary'] = summarize_values(state['values'])
+        if feather is not None:
+            if not os.path.isdir(cachedir):
+                os.makedirs(cachedir)
+            tables = [('summary-' + measure, state['values'][measure]) for measure in state['values']]
+            for name, df in tables + [('summary', state['summary'])]:
+                data_path = os.path.join(cachedir, name + '.feather')
+                tmp_path = '{}.{}.tmp'.format(data_path, os.getpid())
+                feather.write_feather(df.reset_index(drop=True), tmp_path, compression='uncompressed')
+                os.replace(tmp_path, data_path)
+            tmp_path = '{}.{}.tmp'.format(info_path, os.getpid())
+            with open(tmp_path, 'w') as f:
+                json.dump({'version': cache_version, 'labels': labels, 'files': state['files']}, f)
+            os.replace(tmp_path, info_path)
+    _summaries[key] = state
+    df = state['summary'].copy()
     if cfgid:
-        prefix = os.path.join(prefix, cfgid)
-    prefix = os.path.join(prefix, tgtid)
-    df = pd.read_csv(prefix + "-size.csv", header=0)
-    df = pd.DataFrame(df[df.roi.str.startswith("seg=")])
-    df.loc[:,'roi'] = df.roi.map(lambda s: int(s.split('=')[1]))
-    df.rename(columns=dict(roi='label'), inplace=True)
-    df = df.assign(vol=df.n*unit)
-    df.insert(1, 'dataset', dataset)
-    df.insert(2, 'regid', regid)
-    df.insert(3, 'cfgid', int(cfgid))
-    df.insert(4, 'tgtid', tgtid)
-    return df.set_index('label')
+        df.insert(0, 'cfgid', int(cfgid))
+    df.insert(0, 'version', version)
+    df.insert(0, 'command', command)
+    df.insert(0, 'toolkit', toolkit)
+    df.insert(0, 'regid', regid)
+    df.insert(0, 'dataset', dataset)
+    return df
+
+
+def summarize_results(dataset, regid=None, toolkit=None, command=None, version=None, cfgid=None, max_workers=1, executor='thread', refresh=True, full=False):
+    """Get table of summary statistics of the results of each dataset, regid, and cfgid.
+
+    The returned table has one row for each parameter set and label group, where group '*'
+    denotes all labels within any group, and the columns listed in summary_columns, i.e.,
+    the mean, median, and percentiles of the mean overlap of the labels within the group
+    over all pairs of images, and the statistics of the other measures over all pairs
+    or target images, followed by the 'vox_<measure>' columns of the voxel-wise measures
+    averaged within the ROIs of the labels of each group. These are updated incrementally, i.e., only result files which
+    were added or modified since the last call are read (see summarize_cfgid), such that
+    a sweep whose results are still being computed can be summarized repeatedly.
+
+    When 'cfgid' is None, all parameter sets with existing result directory are summarized.
+    When 'refresh' is False, new or rewritten result files are not looked for. With
+    'full=True', all result directories are listed again (see get_catalog).
+    The CSV files are read by 'max_workers' concurrent workers (see read_leaves).
+
+    """
+    query = expand_query(dataset, regid=regid, toolkit=toolkit, command=command, version=version)
+    catalogs = {}
+    if full:
+        for args in query:
+            if args[0:2] not in catalogs:
+                catalogs[args[0:2]] = get_catalog(*args[0:2], full=True)
+    cfgids = get_result_cfgids(query, cfgid=cfgid, catalogs=catalogs, refresh=refresh)
+    tables = []
+    for args in query:
+        for arg in select_cfgids(cfgids[args], *args[0:2]):
+            tables.append(summarize_cfgid(args, cfgid=arg, catalogs=catalogs, max_workers=max_workers, executor=executor))
+    if not tables:
+        return pd.DataFrame()
+    return pd.concat(tables, ignore_index=True)
+
+
+def get_summary_cube(dataset, regid=None, toolkit=None, command=None, version=None, cfgid=None, params=True, max_workers=1, executor='thread', refresh=True, full=False):
+    """Get table of summary statistics of each dataset, regid, cfgid, and label group merged with the registration parameters.
+
+    The summary statistics are those of summarize_results, which only reads result files
+    that were added or modified since the last call. When 'params' is True, the columns
+    of the tables of registration parameter sets (see get_params) are appended. The ID
+    columns are converted to categoricals (see compact_dtypes). The returned table is
+    the input of the queries select_cube, rank_cube, top_cube, and pareto_front.
+
+    """
+    df = summarize_results(dataset, regid=regid, toolkit=toolkit, command=command, version=version, cfgid=cfgid,
+                           max_workers=max_workers, executor=executor, refresh=refresh, full=full)
+    if df.empty:
+        return df
+    if params:
+        df = set_params(df)
+    return compact_dtypes(df)
+
+
+def select_cube(cube, where=None, group='*'):
+    """Select rows of summary cube of a given label group which satisfy a condition.
+
+    The condition 'where' is either a boolean array or a query string evaluated with
+    pandas.DataFrame.query, e.g., 'pctexcl_mean < 1 and real_mean < 10'. When 'group'
+    is None, rows of all label groups are selected.
+
+    """
+    if group is not None:
+        cube = cube[cube.group.values == group]
+    if where is None:
+        return cube
+    if isinstance(where, str):
+        return cube.query(where)
+    return cube[where]
+
+
+def rank_cube(cube, by='dsc_mean', ascending=False, per=['dataset', 'regid'], where=None, group='*'):
+    """Rank selected rows of summary cube within each partition by one or more columns.
+
+    Returns the rows selected by select_cube, excluding those with NaN values in the 'by'
+    columns, sorted by rank within each partition of the 'per' columns, with an added 'rank'
+    column starting at 1. Ties are ranked in order of appearance. For example, the best
+    cfgid of each regid on each dataset by mean in-group DSC subject to less than 1%
+    excluded Jacobian determinant values is obtained with rank_cube(cube, where='pctexcl_mean < 1')
+    and selecting the rows with rank 1, which is what top_cube does.
+
+    """
+    by = [by] if isinstance(by, str) else list(by)
+    ascending = [ascending] * len(by) if isinstance(ascending, bool) else list(ascending)
+    per = [] if per is None else ([per] if isinstance(per, str) else list(per))
+    df = select_cube(cube, where=where, group=group).dropna(subset=by)
+    df = df.sort_values(per + by, ascending=[True] * len(per) + ascending, kind='mergesort')
+    if per:
+        rank = df.groupby(per, sort=False, observed=True).cumcount().values + 1
+    else:
+        rank = np.arange(1, len(df) + 1)
+    return df.assign(rank=rank)
+
+
+def top_cube(cube, k=1, by='dsc_mean', ascending=False, per=['dataset', 'regid'], where=None, group='*'):
+    """Get the 'k' best rows of summary cube within each partition, see rank_cube."""
+    df = rank_cube(cube, by=by, ascending=ascending, per=per, where=where, group=group)
+    return df[df['rank'].values <= k]
+
+
+def pareto_mask(values):
+    """Get boolean mask of rows of a 2D array which are not dominated by any other row, where lower values are better."""
+    mask = np.zeros(len(values), dtype=bool)
+    front = []
+    # a row can only be dominated by a row that precedes it in lexicographic order
+    for i in np.lexsort(values.T[::-1]):
+        if front:
+            f = values[front]
+            if np.any(np.all(f <= values[i], axis=1) & np.any(f < values[i], axis=1)):
+                continue
+        front.append(i)
+        mask[i] = True
+    return mask
+
+
+def pareto_front(cube, objectives={'dsc_mean': 'max', 'pctexcl_mean': 'min', 'real_mean': 'min'}, per=['dataset'], where=None, group='*'):
+    """Get rows of summary cube which are Pareto optimal with respect to the given objectives within each partition.
+
+    The 'objectives' dictionary maps column names to either 'min' or 'max'. By default,
+    the trade-off between overlap, Jacobian folding, and runtime of all registration
+    methods and parameter sets is considered for each dataset. Rows with NaN values in
+    any objective column are excluded. The returned rows are sorted by the first objective.
+
+    """
+    columns = list(objectives.keys())
+    signs = np.array([-1. if objectives[c] == 'max' else 1. for c in columns])
+    per = [] if per is None else ([per] if isinstance(per, str) else list(per))
+    df = select_cube(cube, where=where, group=group).dropna(subset=columns)
+    values = df[columns].values.astype(np.float64) * signs
+    mask = np.zeros(len(df), dtype=bool)
+    if per:
+        for rows in df.groupby(per, sort=False, observed=True).indices.values():
+            mask[rows] = pareto_mask(values[rows])
+    else:
+        mask = pareto_mask(values)
+    df = df[mask]
+    return df.sort_values(per + columns[0:1], ascending=[True] * len(per) + [objectives[columns[0]] != 'max'], kind='mergesort')
+
+
+def get_voxel_volume(path):
+    """Get volume of a voxel in mm^3 from the header of a NIfTI image, which is read again only when the file was modified."""
+    mtime = os.stat(path).st_mtime_ns
+    entry = _voxel_volumes.get(path)
+    if entry is None or entry[0] != mtime:
+        entry = [mtime, float(np.prod(nifti.get_spacing(nifti.read_header(path))))]
+        _voxel_volumes[path] = entry
+    return entry[1]
+
+
+def read_label_volumes(dataset, regid=None, toolkit=None, command=None, version=None, cfgid=None, tgtid=None, image=None, imgext=None, column=None, max_workers=1, executor='thread', refresh=True, compact=True):
+    """Read volumes of segmentation labels from the ROI size tables of all targets and parameter sets.
+
+    The rows of the '<tgtid>-size.csv' tables with ROI name '<roi>=<label>' are concatenated
+    into a single table with the ID columns of the results, the 'roi' and numeric 'label',
+    the number of voxels 'n', and the label volume 'vol' in mm^3. This table can be merged
+    with the long format DSC table of read_results on the ID columns and 'label'.
+    When 'cfgid' is None, all parameter sets with existing result directory are read.
+
+    The voxel size is read from the header of the segmentation of each target image, which
+    is given by the 'image' path format string with keys 'topdir', 'dataset', 'roi', 'tgtid',
+    and 'imgext', or a function of (dataset, roi, tgtid) (default: see label_image). The file
+    name extension 'imgext' must be the one set in etc/settings.sh when the images were written,
+    which is also the default value of the module variable 'imgext' used when it is None. Each
+    header is read only once and cached (see get_voxel_volume). The number of voxels is taken from
+    the given size table 'column', or the maximum of all columns by default, because voxels
+    with NaN value in an evaluated image are not counted in the column of this measure.
+
+    """
+    query = expand_query(dataset, regid=regid, toolkit=toolkit, command=command, version=version)
+    catalogs = {}
+    cfgids = get_result_cfgids(query, cfgid=cfgid, catalogs=catalogs, refresh=refresh)
+    leaves = []
+    for args in query:
+        leaves.extend(plan_reads('size', [args], cfgid=cfgids[args], tgtid=tgtid, catalogs=catalogs))
+    df = read_leaves(leaves, max_workers=max_workers, executor=executor)
+    ids = [c for c in ('dataset', 'regid', 'toolkit', 'command', 'version', 'cfgid', 'tgtid') if c in df]
+    if df.empty:
+        return pd.DataFrame(columns=ids + ['roi', 'label', 'n', 'vol'])
+    df = df[df.roi.str.contains('=', regex=False)]
+    if column is None:
+        n = df.drop(columns=ids + ['roi']).max(axis=1)
+    else:
+        n = df[column]
+    roi = df.roi.str.partition('=')
+    try:
+        label = pd.to_numeric(roi[2])
+    except (ValueError, TypeError):
+        label = roi[2]
+    df = df[ids].assign(roi=roi[0], label=label, n=n)
+    if image is None:
+        image = label_image
+    if imgext is None:
+        imgext = globals()['imgext']
+    images = df[['dataset', 'roi', 'tgtid']].drop_duplicates()
+    units = []
+    for args in images.itertuples(index=False):
+        if callable(image):
+            path = image(*args)
+        else:
+            path = image.format(topdir=topdir, dataset=args[0], roi=args[1], tgtid=args[2], imgext=imgext)
+        units.append(get_voxel_volume(path))
+    images = images.assign(unit=units)
+    df = df.merge(images, how='left', on=['dataset', 'roi', 'tgtid'], copy=False)
+    df = df.assign(vol=df.n * df.unit).drop(columns='unit')
+    if compact:
+        df = compact_dtypes(df)
+    return df
@@ -35,6 +35,30 @@ makedir()
   done
 }
 
+# get status of stored outputs of commands (see lib/tools/artifact-store)
+#
+# Reads one line of key and output options per command from STDIN and prints
+# either 'exists', 'linked', or 'missing' for each line. Outputs of commands
+# whose status is 'missing' have to be computed by a job.
+resolve_outputs()
+{
+  "$topdir/$libdir/tools/artifact-store" resolve --store "$stodir"
+}
+
+# print declaration of preprocessing task (see lib/tools/preprocess)
+#
+# Arguments are the task options followed by '--' and the commands, which
+# are separated by '&&' arguments. Each argument is enclosed in single quotes,
+# which can be parsed by Python's shlex.split unlike the output of printf %q.
+task()
+{
+  local arg line=''
+  for arg in "$@"; do
+    line="$line '${arg//\'/\'\\\'\'}'"
+  done
+  echo "${line:1}"
+}
+
 # get relative path
 relpath()
 {